@@ -18,6 +18,7 @@ class Controls():
         self.visualizers = visualizers
         self.showing = 'default'
         self.selected_visualizers = self.visualizers.copy()
+        self._keymap: dict[str, Callable] | None = None
 
     @abc.abstractmethod
     def keymap(self) -> dict[str, Callable]:
@@ -28,9 +29,12 @@ class Controls():
             v.update_radio(self.radio)
 
     def onkey(self, key: str) -> None:
-        keymap = self.keymap()
-        if key in keymap:
-            keymap[key]()
+        # built once on first key, bindings don't change after construction
+        if self._keymap is None:
+            self._keymap = self.keymap()
+        fn = self._keymap.get(key)
+        if fn:
+            fn()
 
 
 class ScanControls(Controls):
@@ -42,13 +46,11 @@ class ScanControls(Controls):
         container: StyledWindow
     ) -> None:
         super().__init__(radio, visualizers, options, container)
-        # create fullscreen versions of some visualizers for toggling
-        self.const = config_visualizer('constellation', radio, options)
-        self.const.layout(container)
-        self.psd = config_visualizer('psd', radio, options)
-        self.psd.layout(container)
-        self.waterfall = config_visualizer('waterfall', radio, options)
-        self.waterfall.layout(container)
+        self.options = options
+        self.container = container
+        # fullscreen versions of some visualizers for toggling, created on
+        # first use since most sessions never toggle
+        self.fullscreen: dict[str, Visualizer] = {}
 
     def keymap(self) -> dict[str, Callable]:
         return {
@@ -62,9 +64,9 @@ class ScanControls(Controls):
             'W': lambda: self.update_rx_bw(-10000000),
             's': lambda: self.update_rx_bw(100000),
             'S': lambda: self.update_rx_bw(10000000),
-            'c': lambda: self.toggle_visualizer('constellation', self.const),
-            'f': lambda: self.toggle_visualizer('waterfall', self.waterfall),
-            'p': lambda: self.toggle_visualizer('psd', self.psd)
+            'c': lambda: self.toggle_visualizer('constellation'),
+            'f': lambda: self.toggle_visualizer('waterfall'),
+            'p': lambda: self.toggle_visualizer('psd')
             # TODO -/+ for gain
         }
 
@@ -76,11 +78,20 @@ class ScanControls(Controls):
         self.radio.update_rx_bw(self.radio.rx_bw() + d)
         self.update_visualizers()
 
-    def toggle_visualizer(self, name: str, visualizer: Visualizer) -> None:
+    def get_fullscreen(self, name: str) -> Visualizer:
+        if name not in self.fullscreen:
+            visualizer = config_visualizer(name, self.radio, self.options)
+            visualizer.layout(self.container)
+            self.fullscreen[name] = visualizer
+        return self.fullscreen[name]
+
+    def toggle_visualizer(self, name: str) -> None:
         self.visualizers.clear()
         if self.showing == name:
             self.showing = 'default'
             self.visualizers.extend(self.selected_visualizers)
         else:
             self.showing = name
-            self.visualizers.append(visualizer)
+            self.visualizers.append(self.get_fullscreen(name))
+        # hidden visualizers miss radio updates, catch them up
+        self.update_visualizers()
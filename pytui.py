@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, Iterable
 import sys
 import math
 import re
@@ -40,6 +40,11 @@ class Canvas():
         self.width = cols * 2   # size in braille points
         self.height = rows * 4
         self.codes = [0]*(cols*rows)
+        self.blank = [0]*(cols*rows)   # copied over codes to clear in place
+
+    def clear(self) -> None:
+        """Unsets all braille points."""
+        self.codes[:] = self.blank
 
     def set(self, x: int, y: int) -> None:
         """Sets a braille point.
@@ -139,6 +144,36 @@ class Plot():
         """
         self.canvas.line(*self.translatexy(x1, y1), *self.translatexy(x2, y2))
 
+    def points(self, xs: Iterable[float], ys: Iterable[float]) -> None:
+        """Draws many points, faster than calling point() for each.
+
+        Args:
+            xs: X coordinates.
+            ys: Y coordinates, one per X coordinate.
+        """
+        (translatexy, setxy) = (self.translatexy, self.canvas.set)
+        for (x, y) in zip(xs, ys):
+            setxy(*translatexy(x, y))
+
+    def polyline(self, xs: Iterable[float], ys: Iterable[float]) -> None:
+        """Draws lines connecting a sequence of coordinate points.
+
+        Each point is only translated once, unlike calling line() for each
+        pair.
+
+        Args:
+            xs: X coordinates.
+            ys: Y coordinates, one per X coordinate.
+        """
+        points = [self.translatexy(x, y) for (x, y) in zip(xs, ys)]
+        line = self.canvas.line
+        for (p1, p2) in zip(points, points[1:]):
+            line(*p1, *p2)
+
+    def clear(self) -> None:
+        """Clears the plot for reuse, keeping its size and range."""
+        self.canvas.clear()
+
     def draw(self) -> str:
         """Returns plot as text."""
         return self.canvas.draw()
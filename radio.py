@@ -1,5 +1,7 @@
 import abc
 import optparse
+import queue
+import threading
 import numpy as np
 
 # https://wiki.analog.com/university/tools/pluto/users/customizing#updating_to_the_ad9364
@@ -13,8 +15,8 @@ RTLSDR_BW_RANGE = (int(1e6), int(3.2e6))
 
 
 class Radio(abc.ABC):
-    def clamp(self, v, a, b) -> int:
-        return min(max(v, a), b)
+    # no per-instance __dict__, subclasses list their own attributes
+    __slots__ = ()
 
     @abc.abstractmethod
     def min_freq(self) -> int:
@@ -60,8 +62,10 @@ class Radio(abc.ABC):
     def update_rx_gain(self, gain: int) -> None:
         pass
 
+    # returns a complex64 sample buffer owned by the radio and reused by the
+    # next call, or fills and returns out if given
     @abc.abstractmethod
-    def rx(self) -> list[np.complex64]:
+    def rx(self, out: np.ndarray | None = None) -> np.ndarray:
         pass
 
     @abc.abstractmethod
@@ -78,6 +82,10 @@ class Radio(abc.ABC):
 
 
 class PlutoRadio(Radio):
+    __slots__ = (
+        'sdr', '_rx_freq', '_rx_bw', '_gain_mode', '_rx_buf', '_rx_raw'
+    )
+
     def __init__(self) -> None:
         import adi
 
@@ -85,6 +93,12 @@ class PlutoRadio(Radio):
         # cache settings to avoid i/o reads later
         self._rx_freq = self.sdr.rx_lo
         self._rx_bw = self.sdr.rx_rf_bandwidth
+        self._gain_mode = self.sdr.gain_control_mode_chan0
+        # persistent buffer handed out by rx(), see update_rx_buffer_size
+        self._rx_buf = np.empty(self.sdr.rx_buffer_size, dtype=np.complex64)
+        # private pyadi-iio hook returning the raw (i, q) channels, which
+        # isn't pinned. rx() falls back to sdr.rx() if it goes away
+        self._rx_raw = getattr(self.sdr, '_rx_buffered_data', None)
 
     def min_freq(self) -> int:
         return PLUTO_FREQ_RANGE[0]
@@ -99,7 +113,8 @@ class PlutoRadio(Radio):
         return PLUTO_BW_RANGE[1]
 
     def update_rx_freq(self, f: int) -> None:
-        f = self.clamp(f, self.min_freq(), self.max_freq())
+        (lo, hi) = PLUTO_FREQ_RANGE
+        f = min(max(f, lo), hi)
         self.sdr.rx_lo = f
         self._rx_freq = f
 
@@ -107,7 +122,8 @@ class PlutoRadio(Radio):
         return self._rx_freq
 
     def update_rx_bw(self, fs: int) -> None:
-        fs = self.clamp(fs, self.min_bw(), self.max_bw())
+        (lo, hi) = PLUTO_BW_RANGE
+        fs = min(max(fs, lo), hi)
         # iq sampling, assume sample rate = bandwidth
         self.sdr.rx_rf_bandwidth = fs
         self.sdr.sample_rate = fs
@@ -118,16 +134,33 @@ class PlutoRadio(Radio):
 
     def update_rx_buffer_size(self, s: int) -> None:
         self.sdr.rx_buffer_size = s
+        self._rx_buf = np.empty(s, dtype=np.complex64)
+
+    def update_rx_gain_mode(self, mode: str) -> None:
+        if mode != self._gain_mode:
+            self.sdr.gain_control_mode_chan0 = mode
+            self._gain_mode = mode
 
     def update_rx_auto_gain(self, attack_type: str) -> None:
-        self.sdr.gain_control_mode_chan0 = attack_type
+        self.update_rx_gain_mode(attack_type)
 
     def update_rx_gain(self, gain: int) -> None:
-        self.sdr.gain_control_mode_chan0 == 'manual'
+        # hardware gain is ignored unless agc is off
+        self.update_rx_gain_mode('manual')
         self.sdr.rx_hardwaregain_chan0 = gain
 
-    def rx(self) -> list[np.complex64]:
-        return self.sdr.rx()
+    def rx(self, out: np.ndarray | None = None) -> np.ndarray:
+        # sdr.rx() builds a fresh complex128 array from the i/q channels on
+        # every call. read the raw channels instead and convert them into the
+        # persistent buffer in one pass.
+        out = self._rx_buf if out is None else out
+        if self._rx_raw is None:
+            out[:] = self.sdr.rx()
+            return out
+        (i, q) = self._rx_raw()
+        out.real = i
+        out.imag = q
+        return out
 
     def update_tx_freq(self, f: int) -> None:
         self.sdr.tx_lo = f
@@ -140,13 +173,16 @@ class PlutoRadio(Radio):
 
 
 class RtlRadio(Radio):
+    __slots__ = ('sdr', '_rx_freq', '_rx_bw', '_rx_buf')
+
     def __init__(self) -> None:
         from rtlsdr import RtlSdr
 
         self.sdr = RtlSdr()
         self._rx_freq = self.sdr.center_freq
         self._rx_bw = self.sdr.sample_rate
-        self._rx_buffer_size = 1024  # some reasonable default
+        # persistent buffer handed out by rx(), sized by update_rx_buffer_size
+        self._rx_buf = np.empty(1024, dtype=np.complex64)  # reasonable default
 
     def min_freq(self) -> int:
         return RTLSDR_FREQ_RANGE[0]
@@ -164,7 +200,8 @@ class RtlRadio(Radio):
         return self._rx_freq
 
     def update_rx_freq(self, f: int) -> None:
-        f = self.clamp(f, self.min_freq(), self.max_freq())
+        (lo, hi) = RTLSDR_FREQ_RANGE
+        f = min(max(f, lo), hi)
         self.sdr.center_freq = f
         self._rx_freq = f
 
@@ -172,12 +209,13 @@ class RtlRadio(Radio):
         return self._rx_bw
 
     def update_rx_bw(self, fs: int) -> None:
-        fs = self.clamp(fs, self.min_bw(), self.max_bw())
+        (lo, hi) = RTLSDR_BW_RANGE
+        fs = min(max(fs, lo), hi)
         self.sdr.sample_rate = fs
         self._rx_bw = fs
 
     def update_rx_buffer_size(self, s: int) -> None:
-        self._rx_buffer_size = s
+        self._rx_buf = np.empty(s, dtype=np.complex64)
 
     def update_rx_auto_gain(self, attack_type: str) -> None:
         self.sdr.gain = 'auto'
@@ -185,8 +223,17 @@ class RtlRadio(Radio):
     def update_rx_gain(self, gain: int) -> None:
         self.sdr.gain = gain
 
-    def rx(self) -> list[np.complex64]:
-        return self.sdr.read_samples(self._rx_buffer_size)
+    def rx(self, out: np.ndarray | None = None) -> np.ndarray:
+        # read_samples() converts through complex128. read the packed u8 i/q
+        # bytes and scale them straight into the persistent complex64 buffer
+        # instead, same (x / 127.5) - 1 mapping as pyrtlsdr.
+        out = self._rx_buf if out is None else out
+        raw = self.sdr.read_bytes(2*len(out))
+        raw = np.ctypeslib.as_array(raw)
+        iq = out.view(np.float32)
+        np.multiply(raw, np.float32(1/127.5), out=iq, dtype=np.float32)
+        iq -= 1.0
+        return out
 
     def update_tx_freq(self, f: int) -> None:
         raise NotImplementedError()
@@ -198,6 +245,72 @@ class RtlRadio(Radio):
         raise NotImplementedError()
 
 
+class SampleStream():
+    """Reads samples from a radio on a background thread.
+
+    Samples are read into a small ring of preallocated buffers so radio i/o
+    overlaps with whatever the caller does with the previous sample. Buffers
+    returned by get() are borrowed and must be handed back with release().
+    close() stops the reader.
+    """
+
+    def __init__(self, radio: Radio, size: int, slots: int = 2) -> None:
+        self.radio = radio
+        self.thread: threading.Thread | None = None
+        self.error: Exception | None = None
+        self.free: queue.Queue[np.ndarray | None] = queue.Queue()
+        self.ready: queue.Queue[np.ndarray | None] = queue.Queue()
+
+        for buf in np.empty((slots, size), dtype=np.complex64):
+            self.free.put(buf)
+
+    def start(self) -> None:
+        if not self.thread:
+            self.thread = threading.Thread(target=self.read, daemon=True)
+            self.thread.start()
+
+    def read(self) -> None:
+        try:
+            while True:
+                buf = self.free.get()
+                if buf is None:     # closed
+                    return
+                self.ready.put(self.radio.rx(buf))
+        except Exception as e:
+            # wake the consumer so the error surfaces on its thread
+            self.error = e
+            self.ready.put(None)
+
+    def get(self) -> np.ndarray:
+        """Blocks until a sample is available and returns the most recent."""
+        buf = self.ready.get()
+        while buf is not None and not self.ready.empty():
+            self.release(buf)
+            buf = self.ready.get_nowait()
+        if buf is None:
+            raise Exception('radio stream stopped') from self.error
+        return buf
+
+    def release(self, buf: np.ndarray) -> None:
+        """Returns a buffer from get() to the stream for reuse."""
+        self.free.put(buf)
+
+    def close(self) -> None:
+        """Stops the reader thread."""
+        self.free.put(None)
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+
+# --gain option to auto gain attack type, anything else is manual gain in db
+AUTO_GAIN_MODES: dict[tuple[type[Radio], str], str] = {
+    (PlutoRadio, 'fast'): 'fast_attack',
+    (PlutoRadio, 'slow'): 'slow_attack',
+    (PlutoRadio, 'auto'): 'fast_attack',
+    (RtlRadio, 'auto'): 'auto'
+}
+
+
 def config_radio(options: optparse.Values) -> Radio:
     radio: Radio
 
@@ -216,12 +329,9 @@ def config_radio(options: optparse.Values) -> Radio:
     else:
         raise optparse.OptionValueError(f'unknown radio {options.radio}.')
 
-    if isinstance(radio, PlutoRadio) and options.gain in ('fast', 'slow'):
-        radio.update_rx_auto_gain(options.gain + '_attack')
-    if isinstance(radio, PlutoRadio) and options.gain == 'auto':
-        radio.update_rx_auto_gain('fast_attack')
-    elif isinstance(radio, RtlRadio) and options.gain == 'auto':
-        radio.update_rx_auto_gain(options.gain)
+    attack_type = AUTO_GAIN_MODES.get((type(radio), options.gain))
+    if attack_type:
+        radio.update_rx_auto_gain(attack_type)
     else:
         radio.update_rx_gain(int(options.gain))
 
@@ -1,12 +1,19 @@
 import signal
-from time import time, sleep
+from time import monotonic, sleep
 from optparse import OptionParser, OptionGroup, OptionValueError
 from pytui import Terminal, Keyboard, StyledWindow, shutdown
 from visualizers import config_visualizer
-from radio import config_radio
+from radio import config_radio, SampleStream
 from controls import ScanControls
 
 
+# container.hsplit() ratios by number of visualizers, top to bottom
+SPLIT_RATIOS: dict[int, tuple[float, ...]] = {
+    1: (),
+    2: (0.35,),
+    3: (0.33, 0.33)
+}
+
 parser = OptionParser('usage: %prog [options]')
 
 # scanner options
@@ -96,53 +103,66 @@ group.add_option('--style', type='string', default='tokyonight', help=(
     'default %default.'
 ))
 
-(options, args) = parser.parse_args()
-
-# radio config
-radio = config_radio(options)
-radio.update_rx_freq(options.frequency)
-
-# ui config
-terminal = Terminal()
-keyboard = Keyboard()
-
-container = StyledWindow(0, 0, terminal.get_columns(), terminal.get_lines())
-
-visopt = options.visualizers.split(',')
-visualizers = [config_visualizer(x, radio, options) for x in visopt]
-
-if len(visualizers) == 1:
-    visualizers[0].layout(container)
-elif len(visualizers) == 2:
-    (top, bottom) = container.hsplit(0.35)
-    visualizers[0].layout(top)
-    visualizers[1].layout(bottom)
-elif len(visualizers) == 3:
-    (top, middle, bottom) = container.hsplit(0.33, 0.33)
-    visualizers[0].layout(top)
-    visualizers[1].layout(middle)
-    visualizers[2].layout(bottom)
-else:
-    raise OptionValueError(f'invalid layout: {options.visualizers}')
-
-signal.signal(signal.SIGINT, lambda signal, frame: shutdown())
-
-controls = ScanControls(radio, visualizers, options, container)
-keyboard.listen(controls.onkey)
-
-# start scanning
-try:
-    terminal.fullscreen()
-
-    while True:
-        start = time()
-        sample = radio.rx()
-        for v in visualizers:
-            v.update_sample(sample)
-            v.draw()
-        terminal.flush()
-        delta = time() - start
-        if options.fps != 0:
-            sleep(max(0, (1/options.fps) - delta))
-finally:
-    shutdown()
+
+def main() -> None:
+    signal.signal(signal.SIGINT, lambda *_: shutdown())
+
+    (options, args) = parser.parse_args()
+
+    # radio config
+    radio = config_radio(options)
+    radio.update_rx_freq(options.frequency)
+
+    # ui config
+    terminal = Terminal()
+    keyboard = Keyboard()
+
+    (w, h) = (terminal.get_columns(), terminal.get_lines())
+    container = StyledWindow(0, 0, w, h)
+
+    visopt = options.visualizers.split(',')
+    visualizers = [config_visualizer(x, radio, options) for x in visopt]
+
+    ratios = SPLIT_RATIOS.get(len(visualizers))
+    if ratios is None:
+        raise OptionValueError(f'invalid layout: {options.visualizers}')
+    panes = container.hsplit(*ratios) if ratios else [container]
+    for v, pane in zip(visualizers, panes):
+        v.layout(pane)
+
+    controls = ScanControls(radio, visualizers, options, container)
+    keyboard.listen(controls.onkey)
+
+    stream = SampleStream(radio, options.fftsize)
+
+    # start scanning
+    try:
+        terminal.fullscreen()
+        stream.start()
+
+        # pace frames against a fixed deadline so an overrun frame doesn't
+        # shift every frame after it
+        period = 1.0/options.fps if options.fps else 0.0
+        next_tick = monotonic() + period
+
+        # bound once, these run every frame
+        (get, release, flush) = (stream.get, stream.release, terminal.flush)
+
+        while True:
+            sample = get()
+            for v in visualizers:
+                v.update_and_draw(sample)
+            release(sample)
+            flush()
+            if period:
+                sleep(max(0.0, next_tick - monotonic()))
+                next_tick += period
+    finally:
+        try:
+            stream.close()
+        finally:
+            shutdown()
+
+
+if __name__ == '__main__':
+    main()
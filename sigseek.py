@@ -1,4 +1,6 @@
 import signal
+import numpy as np
+from time import monotonic
 from optparse import OptionParser, OptionGroup
 from pytui import Terminal, StyledWindow, shutdown
 from visualizers import Seek, config_visualizer
@@ -73,42 +75,68 @@ group.add_option('--style', type='string', default='tokyonight', help=(
     'default %default'
 ))
 
-(options, args) = parser.parse_args()
 
-# radio config
-radio = config_radio(options)
+def main() -> None:
+    signal.signal(signal.SIGINT, lambda *_: shutdown())
 
-# ui config
-terminal = Terminal()
+    (options, args) = parser.parse_args()
 
-seek = config_visualizer('seek', radio, options)
-if not isinstance(seek, Seek):
-    raise Exception('expected instance of Seek')
+    # radio config
+    radio = config_radio(options)
 
-seek.layout(StyledWindow(0, 0, terminal.get_columns(), terminal.get_lines()))
+    # ui config
+    terminal = Terminal()
 
-signal.signal(signal.SIGINT, lambda signal, frame: shutdown())
+    seek = config_visualizer('seek', radio, options)
+    if not isinstance(seek, Seek):
+        raise Exception('expected instance of Seek')
 
-# seek
-(step, linger) = (options.rate, options.linger)
-
-try:
-    terminal.fullscreen()
+    (w, h) = (terminal.get_columns(), terminal.get_lines())
+    seek.layout(StyledWindow(0, 0, w, h))
 
     # seek
-    while True:
-        for f in range(int(seek.fstart), int(seek.fstop)+step, step):
-            radio.update_rx_freq(f)
-            seek.update_header()
-
-            for i in range(linger):
-                sample = radio.rx()
-
-                if seek.have_signal(sample):
-                    seek.update_sample(sample)
-                    break
-
-            seek.draw()
-            terminal.flush()
-finally:
-    shutdown()
+    (step, linger) = (options.rate, options.linger)
+    freqs = range(int(seek.fstart), int(seek.fstop)+step, step)
+
+    # bound once, these run for every step of every sweep
+    (update_rx_freq, rx) = (radio.update_rx_freq, radio.rx)
+    (update_header, draw) = (seek.update_header, seek.draw)
+    (try_update_samples, flush) = (seek.try_update_samples, terminal.flush)
+
+    # every sample lingered on is read straight into a row, then analysed as
+    # a batch
+    batch = np.empty((linger, options.fftsize), dtype=np.complex64)
+
+    # redraw at least this often (seconds) so the header shows sweep progress
+    # when nothing is found, and at most this often when signals keep coming
+    (refresh, frame) = (0.1, 1/30)
+
+    try:
+        terminal.fullscreen()
+
+        # seek
+        last_draw = 0.0
+        while True:
+            for f in freqs:
+                update_rx_freq(f)
+                update_header()
+
+                for row in batch:
+                    rx(row)
+                found = try_update_samples(batch)
+
+                # drawing dominates empty sweeps, only draw when there's news
+                # and the frame budget allows. anything found in between is
+                # picked up by the next draw
+                now = monotonic()
+                elapsed = now - last_draw
+                if elapsed >= refresh or (found and elapsed >= frame):
+                    draw()
+                    flush()
+                    last_draw = now
+    finally:
+        shutdown()
+
+
+if __name__ == '__main__':
+    main()
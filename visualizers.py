@@ -1,57 +1,91 @@
 import abc
+import os
 import optparse
-import random
 import numpy as np
-from typing import cast
+from functools import lru_cache
 from scipy import signal
 from scipy import fft
-from scipy import interpolate
+from numpy.lib.stride_tricks import sliding_window_view
 from matplotlib import colormaps
 from math import ceil
 from pytui import StyledWindow, Plot, Text
 from radio import Radio, RtlRadio, PlutoRadio
 
-
-# returns a matplotlib color map as rgb tuples
-def get_colormap(name: str) -> list[tuple[int, int, int]]:
-    colors = [colormaps[name](x) for x in range(0, 256)]
-    return [(int(r*255), int(g*255), int(b*255)) for (r, g, b, a) in colors]
-
-
-# returns a gradient between two colors as rgb tuples
+# optionally route every scipy.fft call (including those made by
+# scipy.signal) through fftw, keeping plans alive between frames since
+# sizes never change
+try:
+    import pyfftw.interfaces.scipy_fft
+    fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(30)
+except ImportError:
+    pass
+
+# threads for batched ffts. a single transform at these sizes is over before
+# a thread pool would get going, so threads are only used for many rows
+FFT_WORKERS = os.cpu_count() or 1
+FFT_BATCH_ROWS = 16
+
+
+# returns a (shared, read-only) matplotlib color map as a (256, 3) array of
+# rgb values
+@lru_cache
+def get_colormap(name: str) -> np.ndarray:
+    # integer input indexes the map's lookup table directly, in one call
+    rgba = colormaps[name](np.arange(256))
+    colormap = (rgba[:, :3] * 255).astype(np.uint8)
+    colormap.flags.writeable = False
+    return colormap
+
+
+# returns a gradient between two colors as an (n, 3) array of rgb values
 def color_gradient(
     start: tuple[int, int, int],
     end: tuple[int, int, int],
     n: int
-) -> list[tuple[int, int, int]]:
-    gradient = [start]
-    for t in range(1, n):
-        gradient.append(cast(tuple[int, int, int], tuple([
-          int(start[j] + (float(t)/(n-1))*(end[j]-start[j]))
-          for j in range(3)
-        ])))
-    return gradient
+) -> np.ndarray:
+    # integer steps, floored the same as truncating the float lerp since
+    # every color is positive
+    (a, b) = (np.array(start), np.array(end))
+    t = np.arange(n)[:, np.newaxis]
+    return (a + t*(b-a)//max(n-1, 1)).astype(np.uint8)
 
 
-def get_matrix_colormap() -> list[tuple[int, int, int]]:
+def get_matrix_colormap() -> np.ndarray:
     black = (0, 0, 0)
     vampire = (0x0d, 0x02, 0x08)
     dark_green = (0x00, 0x3b, 0x00)
     islamic_green = (0x00, 0x8f, 0x11)
     malachite = (0x00, 0xff, 0x41)
-    return (
-        color_gradient(black, vampire, 96)
-        + color_gradient(vampire, dark_green, 32)
-        + color_gradient(dark_green, islamic_green, 64)
-        + color_gradient(islamic_green, malachite, 64)
-    )
+    return np.concatenate([
+        color_gradient(black, vampire, 96),
+        color_gradient(vampire, dark_green, 32),
+        color_gradient(dark_green, islamic_green, 64),
+        color_gradient(islamic_green, malachite, 64)
+    ])
+
+
+MATRIX_GLYPHS = np.array(list(
+    'ｦｱｲｳｴｵｶｷｸｹｺｻｼｽｾｿﾀﾁﾂﾃﾄﾅﾆﾇﾈﾉﾊﾋﾌﾍﾎﾏﾐﾑﾒﾓﾔﾕﾖﾗﾘﾙﾚﾛﾜﾝ'
+))
+GLYPH_RNG = np.random.default_rng()
+
+
+# returns n random matrix glyphs
+def matrix_glyphs(n: int) -> str:
+    if n == 0:
+        return ''
+    glyphs = MATRIX_GLYPHS[GLYPH_RNG.integers(len(MATRIX_GLYPHS), size=n)]
+    # n contiguous single character strings read as one n character string
+    return str(glyphs.view(f'U{n}')[0])
 
 
 Styles: dict[str, dict] = {
     # colors from
     # https://marketplace.visualstudio.com/items?itemName=enkia.tokyo-night
     'tokyonight': {
-        'waterfall-glyph': lambda: '█',
+        'waterfall-glyph': lambda n: '█' * n,
         'colormap': get_colormap('viridis'),
         'header': {'bg': 0x1a1b26, 'fg': 0xa9b1d6},
         # 'plot': {'bg': 0x24283b, 'fg': 0xf7768e},   # red
@@ -61,7 +95,7 @@ Styles: dict[str, dict] = {
 
     # https://matplotlib.org/matplotblog/posts/matplotlib-cyberpunk-style/
     'cyberpunk': {
-        'waterfall-glyph': lambda: '█',
+        'waterfall-glyph': lambda n: '█' * n,
         'colormap': get_colormap('viridis'),
         'header': {'bg': 0x2A3459, 'fg': 0x08F7FE},
         # 'plot': {'bg': 0x2A3459, 'fg': 0x08F7FE},
@@ -71,9 +105,7 @@ Styles: dict[str, dict] = {
 
     # https://www.schemecolor.com/matrix-code-green.php
     'matrix': {
-        'waterfall-glyph': lambda: random.choice(
-            'ｦｱｲｳｴｵｶｷｸｹｺｻｼｽｾｿﾀﾁﾂﾃﾄﾅﾆﾇﾈﾉﾊﾋﾌﾍﾎﾏﾐﾑﾒﾓﾔﾕﾖﾗﾘﾙﾚﾛﾜﾝ'
-        ),
+        'waterfall-glyph': matrix_glyphs,
         'colormap': get_matrix_colormap(),
         'header': {'bg': 0x0d0208, 'fg': 0x008f11},
         'plot': {'bg': 0x0d0208, 'fg': 0x00ff41},
@@ -82,7 +114,7 @@ Styles: dict[str, dict] = {
 
     # https://www.nordtheme.com/docs/colors-and-palettes
     'nord': {
-        'waterfall-glyph': lambda: '█',
+        'waterfall-glyph': lambda n: '█' * n,
         'colormap': get_colormap('cividis'),
         'header': {'bg': 0xd8dee9, 'fg': 0x81a1c1},
         'plot': {'bg': 0xeceff4, 'fg': 0x2e3440},
@@ -102,6 +134,8 @@ def format_freq(f: float) -> str:
     return f'{(f/1000):.4f}'.rstrip('0').rstrip('.') + ' ' + s
 
 
+# only depends on the window width and tuning, which rarely change
+@lru_cache(maxsize=8)
 def make_frequency_labels(width: int, start: float, end: float) -> str:
     # *2 to account for flipping at midpoint
     maxWidth = 2*len('|999.9999 Mhz ')
@@ -111,7 +145,8 @@ def make_frequency_labels(width: int, start: float, end: float) -> str:
 
     ticks = np.linspace(0, width, n)
     values = np.linspace(start, end, len(ticks))
-    labels = ''.ljust(width)
+    # spliced in place rather than rebuilding the string per tick
+    labels = bytearray(b' ' * width)
 
     for i in range(0, n):
         hz = format_freq(values[i])
@@ -119,11 +154,12 @@ def make_frequency_labels(width: int, start: float, end: float) -> str:
             (hz, x) = ('|'+hz, int(ticks[i]))
         else:
             (hz, x) = (hz+'|', int(ticks[i]) - len(hz+'|'))
-        labels = labels[:x] + hz + labels[x + len(hz):]
+        labels[x:x + len(hz)] = hz.encode('ascii')
 
-    return labels
+    return labels.decode('ascii')
 
 
+@lru_cache
 def make_db_labels(width: int, height: int, mindb: float, maxdb: float) -> str:
     scale = [' '.ljust(width)]*height
     labels = np.linspace(maxdb, mindb, height//2)
@@ -132,52 +168,154 @@ def make_db_labels(width: int, height: int, mindb: float, maxdb: float) -> str:
     return "\n".join(scale)
 
 
-def get_psd(
-    sample: list[np.complex64],
-    window: str = 'hann',
+# returns a (shared, read-only) scipy window array of a given size
+@lru_cache
+def make_window(name: str, nperseg: int) -> np.ndarray:
+    window = signal.get_window(name, nperseg).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+# returns indices that reorder an n point spectrum like fft.fftshift, a
+# single gather being much cheaper than fftshift's per-call roll
+@lru_cache
+def fftshift_index(n: int) -> np.ndarray:
+    index = np.roll(np.arange(n), n//2)
+    index.flags.writeable = False
+    return index
+
+
+# returns get_psd() without the density scaling, see get_psd_scale()
+def get_power(
+    sample: np.ndarray,
+    window: str | np.ndarray = 'hann',
+    nperseg: int = None
+) -> np.ndarray:
+    # spectra are only displayed, float32 precision is plenty and halves the
+    # bytes moved through every later step. a 2d sample is a batch of rows,
+    # transformed in one call.
+    # radio buffers already are contiguous complex64, anything else is
+    # converted once here so every fft takes the single precision path
+    sample = np.ascontiguousarray(sample, dtype=np.complex64)
+    n = sample.shape[-1]
+    if nperseg is None or nperseg == n:
+        # signal.periodogram, which is welch with one segment
+        (nperseg, segments) = (n, sample)
+    else:
+        # half overlapping segments, as welch defaults to
+        step = nperseg - nperseg//2
+        segments = sliding_window_view(sample, nperseg, axis=-1)
+        segments = segments[..., ::step, :]
+    if isinstance(window, str):
+        window = make_window(window, nperseg)
+
+    # same as signal.welch (constant detrend, two-sided, mean average)
+    # without its per-call argument handling. one scratch array is reused
+    # through detrend, window and fft
+    spectrum = np.subtract(segments, np.mean(segments, -1, keepdims=True))
+    spectrum *= window
+    rows = spectrum.size // nperseg
+    workers = FFT_WORKERS if rows >= FFT_BATCH_ROWS else 1
+    spectrum = fft.fft(spectrum, overwrite_x=True, workers=workers)
+    power = np.abs(spectrum)
+    power *= power
+    if segments is not sample:
+        power = np.mean(power, axis=-2)
+    power = power.astype(np.float32, copy=False)
+    return power[..., fftshift_index(power.shape[-1])]
+
+
+# returns the density scaling get_psd() applies for n samples per row
+def get_psd_scale(
+    n: int,
+    window: str | np.ndarray = 'hann',
     nperseg: int = None,
     fs: int = None
-) -> list[float]:
-    if nperseg is None or nperseg == len(sample):
-        _, power = signal.periodogram(
-            sample,
-            window=window,
-            return_onesided=False
-        )
-    else:
-        _, power = signal.welch(
-            sample,
-            window=window,
-            return_onesided=False,
-            nperseg=nperseg,
-            fs=fs
-        )
-    return fft.fftshift(power)
-
-
-def to_db(values: list[float]) -> list[float]:
-    return list(10.0 * np.log10(values))
-
-
-def zero_adjust(values: list[float], offset: float) -> list[float]:
-    return [x - offset for x in values]
+) -> float:
+    if nperseg is None or nperseg == n:
+        (nperseg, fs) = (n, 1)  # periodogram is not scaled by fs
+    elif fs is None:
+        fs = 1
+    if isinstance(window, str):
+        window = make_window(window, nperseg)
+    return 1.0 / (fs * float(np.dot(window, window)))
 
 
-def to_dbfs(values: list[float], offset: float) -> list[float]:
-    return zero_adjust(to_db(values), offset)
-
-
-# fits a list of one size to another by lerping the values
-def fit_values(values: list[float], length: int) -> list[float]:
+def get_psd(
+    sample: np.ndarray,
+    window: str | np.ndarray = 'hann',
+    nperseg: int = None,
+    fs: int = None
+) -> np.ndarray:
+    power = get_power(sample, window, nperseg)
+    power *= get_psd_scale(sample.shape[-1], window, nperseg, fs)
+    return power
+
+
+# returns an upper bound on any bin of get_psd() for the same arguments, far
+# cheaper than the psd itself. by cauchy-schwarz a windowed (and detrended)
+# segment can't put more than its own energy into one bin, and the density
+# scaling divides the window energy back out. one bound per row for a batch.
+def get_psd_ceiling(
+    sample: np.ndarray,
+    nperseg: int = None,
+    fs: int = None
+) -> float | np.ndarray:
+    if fs is None or nperseg is None or nperseg == sample.shape[-1]:
+        fs = 1  # periodogram is not scaled by fs, see get_psd
+    if sample.ndim == 1:
+        return np.vdot(sample, sample).real / fs
+    return np.einsum('ij,ij->i', sample.conj(), sample).real / fs
+
+
+# the following take an optional out array to write to, which may be values
+def to_db(values: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    # floored so empty bins come out as -300db rather than -inf, which can't
+    # be plotted
+    out = np.maximum(values, np.float32(1e-30), out=out)
+    out = np.log10(out, out=out)
+    out *= 10.0
+    return out
+
+
+def to_dbfs(
+    values: np.ndarray,
+    offset: float,
+    out: np.ndarray | None = None
+) -> np.ndarray:
+    return np.subtract(to_db(values, out), offset, out=out)
+
+
+# returns the indices fit_values picks from n values to make length values
+@lru_cache
+def fit_index(n: int, length: int) -> np.ndarray:
+    # linearly subdivide into length points, nearest neighbour rounding half
+    # down (same as interp1d(kind='nearest'))
+    index = np.ceil(np.linspace(0, n-1, length) - 0.5).astype(np.intp)
+    index.flags.writeable = False
+    return index
+
+
+# fits an array of one size to another by picking the nearest values
+def fit_values(values: np.ndarray, length: int) -> np.ndarray:
     if len(values) == length:
         return values
-    # create function to interpolate from 0-length to values
-    x = np.arange(0, len(values))
-    f = interpolate.interp1d(np.arange(0, len(values)), values, kind='nearest')
-    # linearly subdivide x into length sample
-    sx = np.linspace(x[0], x[-1], length)
-    # scale sample into new length
-    return f(sx)
+    return values[fit_index(len(values), length)]
+
+
+# folds density scaling, dbfs conversion and normalizing to 0-255 across lo
+# to hi into a clip of unscaled power and one affine step after the log.
+# returns (min power, max power, gain, bias)
+def fold_dbfs_u8(
+    scale: float,
+    zoff: float,
+    lo: float,
+    hi: float
+) -> tuple[float, float, float, float]:
+    # dbfs = 10*log10(power*scale) - zoff, index = (dbfs - lo) * 255/(hi-lo)
+    k = 255 / (hi - lo)
+    (pmin, pmax) = (10**((lo+zoff)/10) / scale, 10**((hi+zoff)/10) / scale)
+    return (pmin, pmax, 10*k, (10*np.log10(scale) - zoff - lo) * k)
 
 
 class Visualizer(abc.ABC):
@@ -195,7 +333,7 @@ class Visualizer(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def update_sample(self, sample: list[np.complex64]) -> None:
+    def update_sample(self, sample: np.ndarray) -> None:
         pass
 
     @abc.abstractmethod
@@ -206,6 +344,10 @@ class Visualizer(abc.ABC):
         for window in self.windows:
             window.draw()
 
+    def update_and_draw(self, sample: np.ndarray) -> None:
+        self.update_sample(sample)
+        self.draw()
+
 
 class FFTVisualizer(Visualizer):
     def __init__(
@@ -214,7 +356,7 @@ class FFTVisualizer(Visualizer):
         mindbfs: int = 0,
         maxdbfs: int = 50,
         nperseg: int = 1024,
-        window: str = 'hann',
+        window: str | np.ndarray = 'hann',
         zoff: float = -1.0,
         style: dict = Styles['tokyonight']
     ) -> None:
@@ -222,16 +364,48 @@ class FFTVisualizer(Visualizer):
         self.mindbfs = mindbfs
         self.maxdbfs = maxdbfs
         self.nperseg = nperseg
-        self.window = window
+        # resolved up front, get_psd would otherwise look it up every frame
+        if isinstance(window, str):
+            window = make_window(window, nperseg)
+        self.window: np.ndarray = window
         self.zoff = zoff
+        # get_dbfs_u8 constants for the last (sample size, fs, lo, hi) only,
+        # they change on bandwidth and range steps
+        self._u8_key: tuple | None = None
+        self._u8_fold: tuple[float, float, float, float] = (0, 0, 0, 0)
 
-    def get_dbfs(self, sample: list[np.complex64]) -> list[float]:
-        return to_dbfs(get_psd(
+    def get_dbfs(self, sample: np.ndarray) -> np.ndarray:
+        psd = get_psd(
             sample,
             window=self.window,
             nperseg=self.nperseg,
             fs=self.radio.rx_bw()
-        ), self.zoff)
+        )
+        # psd is a fresh array, convert it in place
+        return to_dbfs(psd, self.zoff, out=psd)
+
+    # dbfs quantized to 0-255 across lo to hi, for indexing a colormap
+    def get_dbfs_u8(
+        self,
+        sample: np.ndarray,
+        lo: float,
+        hi: float
+    ) -> np.ndarray:
+        (n, fs) = (sample.shape[-1], self.radio.rx_bw())
+        key = (n, fs, lo, hi)
+        if key != self._u8_key:
+            scale = get_psd_scale(n, self.window, self.nperseg, fs)
+            self._u8_fold = fold_dbfs_u8(scale, self.zoff, lo, hi)
+            self._u8_key = key
+
+        # the clip keeps the log finite, so no floor is needed
+        (pmin, pmax, gain, bias) = self._u8_fold
+        power = get_power(sample, self.window, self.nperseg)
+        np.clip(power, pmin, pmax, out=power)
+        np.log10(power, out=power)
+        power *= gain
+        power += bias
+        return power.astype(np.uint8)
 
 
 class Seek(FFTVisualizer):
@@ -243,24 +417,32 @@ class Seek(FFTVisualizer):
         mindbfs: int = 0,
         maxdbfs: int = 50,
         nperseg: int = 1024,
-        window: str = 'hann',
+        window: str | np.ndarray = 'hann',
         zoff: float = -1.0,
         style: dict = Styles['tokyonight']
     ) -> None:
         super().__init__(radio, mindbfs, maxdbfs, nperseg, window, zoff, style)
         self.fstart = fstart
         self.fstop = fstop
-        self.signals: dict[int, float] = {}
-
-    def find_signals(
-        self,
-        sample: list[np.complex64]
-    ) -> list[tuple[int, float]]:
-        dbfs = self.get_dbfs(sample)
-        return [(i, x) for i, x in enumerate(dbfs) if x >= self.mindbfs]
-
-    def have_signal(self, sample: list[np.complex64]) -> bool:
-        return len(self.find_signals(sample)) > 0
+        # peak dbfs of every fft bin across the whole range, -inf until seen.
+        # bin 0 is the lowest bin when tuned to fstart, so each tune step
+        # covers one contiguous slice
+        self.bin_hz = radio.rx_bw() / nperseg
+        nbins = round((fstop - fstart) / self.bin_hz) + nperseg
+        self.peaks = np.full(nbins, -np.inf, dtype=np.float32)
+        # running argmax of peaks, kept by update_dbfs for the header
+        self.peak_bin: int | None = None
+        # peaks changed since the plot was last rendered
+        self.dirty = False
+
+    # returns frequencies of peak bins
+    def bin_freqs(self, bins: np.ndarray) -> np.ndarray:
+        offset = self.fstart - (self.nperseg//2) * self.bin_hz
+        return np.rint(offset + bins * self.bin_hz).astype(np.int64)
+
+    # returns the bins that have been seen
+    def seen_bins(self) -> np.ndarray:
+        return np.flatnonzero(self.peaks > -np.inf)
 
     def layout(self, container: StyledWindow) -> None:
         dbwidth = max(len(str(self.mindbfs)), len(str(self.maxdbfs)))
@@ -276,6 +458,16 @@ class Seek(FFTVisualizer):
         self.xaxis.update_style(self.style['plot-label'])
         self.yaxis.update_style(self.style['plot-label'])
 
+        # reused for every redraw until the next layout
+        self._plot = Plot(
+            self.plot.width,
+            self.plot.height,
+            self.fstart,
+            self.mindbfs,
+            self.fstop,
+            self.maxdbfs
+        )
+
         self.update_header()
         self.update_yaxis()
         self.update_xaxis()
@@ -283,9 +475,10 @@ class Seek(FFTVisualizer):
     def update_header(self) -> None:
         f = self.radio.rx_freq()
         peak = 'None'
-        if self.signals:
-            peakf = max(self.signals, key=lambda k: self.signals[k])
-            peakdb = round(self.signals[peakf])
+        k = self.peak_bin
+        if k is not None:
+            peakf = int(self.bin_freqs(np.array(k)))
+            peakdb = round(float(self.peaks[k]))
             peak = f'{peakf:8} ({peakdb})'
 
         self.header.update_content(
@@ -307,36 +500,75 @@ class Seek(FFTVisualizer):
         ))
 
     def update_plot(self) -> None:
-        plot = Plot(
-            self.plot.width,
-            self.plot.height,
-            self.fstart,
-            self.mindbfs,
-            self.fstop,
-            self.maxdbfs
-        )
+        # maxdbfs grows with the loudest signal
+        plot = self._plot
+        plot.clear()
+        plot.maxy = self.maxdbfs
 
-        for freq, dbfs in self.signals.items():
-            plot.point(freq, dbfs)
+        bins = self.seen_bins()
+        plot.points(self.bin_freqs(bins).tolist(), self.peaks[bins].tolist())
 
         self.plot.update_content(plot.draw())
 
-    def update_sample(self, sample: list[np.complex64]) -> None:
-        signals = self.find_signals(sample)
-        update = False
-
-        for foff, dbfs in signals:
-            freq = self.radio.rx_freq()+(foff-self.radio.rx_bw()//2)
-
-            if freq not in self.signals or self.signals[freq] < dbfs:
-                update = True
-                self.signals[freq] = dbfs
-                if dbfs > self.maxdbfs:
-                    self.maxdbfs = round(dbfs)
-
-        if update:
+    # merges a spectrum taken at the current frequency into the peaks
+    def update_dbfs(self, dbfs: np.ndarray) -> None:
+        # slice of peaks covered by this tune step, clipped to the range
+        start = round((self.radio.rx_freq() - self.fstart) / self.bin_hz)
+        lo = max(start, 0)
+        hi = min(start + len(dbfs), len(self.peaks))
+        if lo >= hi:
+            return
+        (peaks, dbfs) = (self.peaks[lo:hi], dbfs[lo-start:hi-start])
+
+        # nothing above the threshold is the common case, settle it with one
+        # compare before looking at the peaks
+        louder = dbfs >= self.mindbfs
+        if not louder.any():
+            return
+        louder &= dbfs > peaks
+        if not louder.any():
+            return
+        peaks[louder] = dbfs[louder]
+
+        # peaks only grow, so the loudest merged bin is the new max if it
+        # beats the old one
+        louder = np.flatnonzero(louder)
+        k = louder[np.argmax(dbfs[louder])]
+        peak = dbfs[k]
+        if self.peak_bin is None or peak > self.peaks[self.peak_bin]:
+            self.peak_bin = lo + int(k)
+
+        # labels only depend on the range
+        if peak > self.maxdbfs:
+            self.maxdbfs = round(peak)
             self.update_yaxis()
+        # rendering is left to draw, many merges can land between frames
+        self.dirty = True
+
+    def update_sample(self, sample: np.ndarray) -> None:
+        self.update_dbfs(self.get_dbfs(sample))
+
+    # merges a batch of samples taken at one frequency (one per row) and
+    # returns whether any had a signal. most of a sweep is empty, so rows are
+    # first rejected on sample energy. the rest share a single fft call, and
+    # every row with a signal is merged
+    def try_update_samples(self, samples: np.ndarray) -> bool:
+        ceiling = get_psd_ceiling(samples, self.nperseg, self.radio.rx_bw())
+        rows = np.flatnonzero(ceiling >= 10 ** ((self.mindbfs+self.zoff)/10))
+        if not len(rows):
+            return False
+        dbfs = self.get_dbfs(samples[rows])
+        hits = dbfs.max(axis=1) >= self.mindbfs
+        if not hits.any():
+            return False
+        self.update_dbfs(dbfs[hits].max(axis=0))
+        return True
+
+    def draw(self) -> None:
+        if self.dirty:
             self.update_plot()
+            self.dirty = False
+        super().draw()
 
     def update_radio(self, radio: Radio) -> None:
         self.radio = radio
@@ -355,6 +587,16 @@ class PSD(FFTVisualizer):
         self.xaxis.update_style(self.style['plot-label'])
         self.yaxis.update_style(self.style['plot-label'])
 
+        # reused for every frame until the next layout, x spans the psd bins
+        self._plot = Plot(
+            self.plot.width,
+            self.plot.height,
+            0,
+            self.mindbfs,
+            self.nperseg,
+            self.maxdbfs
+        )
+
         self.update_yaxis()
         self.update_xaxis()
 
@@ -373,25 +615,16 @@ class PSD(FFTVisualizer):
             self.maxdbfs
         ))
 
-    def update_plot(self, values: list[float]) -> None:
-        plot = Plot(
-            self.plot.width,
-            self.plot.height,
-            0,
-            self.mindbfs,
-            len(values),
-            self.maxdbfs
-        )
+    def update_plot(self, values: np.ndarray) -> None:
+        plot = self._plot
+        plot.clear()
+        plot.maxx = len(values)
 
-        (x1, y1) = (0, values[0])
-        for x in range(1, len(values)):
-            y = values[x]
-            plot.line(x1, y1, x, y)
-            (x1, y1) = (x, y)
+        plot.polyline(range(len(values)), values.tolist())
 
         self.plot.update_content(plot.draw())
 
-    def update_sample(self, sample: list[np.complex64]) -> None:
+    def update_sample(self, sample: np.ndarray) -> None:
         self.update_plot(self.get_dbfs(sample))
 
     def update_radio(self, radio: Radio) -> None:
@@ -407,6 +640,13 @@ class Waterfall(FFTVisualizer):
         self.xaxis.update_style(self.style['plot-label'])
         self.update_xaxis()
 
+        # ansi style prefix per colormap entry, indexed by normalized dbfs
+        bg = self.style['plot']['bg']
+        self._glyph_styles = [
+            Text('').style({'bg': bg, 'fg': tuple(rgb)}, '')
+            for rgb in self.style['colormap'].tolist()
+        ]
+
     def update_xaxis(self) -> None:
         f = self.radio.rx_freq()
         r = self.radio.rx_bw()
@@ -414,27 +654,21 @@ class Waterfall(FFTVisualizer):
             self.xaxis.width, f-r/2, f+r/2
         ))
 
-    def update_sample(self, sample: list[np.complex64]) -> None:
-        def norm(x: float) -> int:
-            x = min(max(x, self.mindbfs), self.maxdbfs)
-            return int((x-self.mindbfs)/(self.maxdbfs-self.mindbfs) * 255)
-
-        dbfs = self.get_dbfs(sample)
-
-        # lerp to waterfall width and normalize values to 0-255
-        values = [norm(x) for x in fit_values(dbfs, self.waterfall.width)]
-
-        # map to rgb value in style colormap
-        colors = [self.style['colormap'][x] for x in values]
-
-        # map to styled glyph
-        chars = [
-            Text(self.style['waterfall-glyph']()).style({
-                'bg': self.style['plot']['bg'],
-                'fg': x
-            })
-            for x in colors
-        ]
+    def update_sample(self, sample: np.ndarray) -> None:
+        # normalize to 0-255 then lerp to waterfall width. picking nearest
+        # values commutes with the normalization, so it's done on bytes
+        index = self.get_dbfs_u8(sample, self.mindbfs, self.maxdbfs)
+        index = fit_values(index, self.waterfall.width)
+
+        # map to styled glyphs, colored by the style colormap. neighbouring
+        # bins often quantize to the same color, so each run of a color is
+        # styled once. a row's glyphs are made in one go
+        (glyphs, styles) = (self.style['waterfall-glyph'], self._glyph_styles)
+        starts = (np.flatnonzero(index[1:] != index[:-1]) + 1).tolist()
+        (starts, ends) = ([0] + starts, starts + [len(index)])
+        runs = zip(index[starts].tolist(), starts, ends)
+        line = glyphs(len(index))
+        chars = [styles[i] + line[s:e] + "\x1b[0m" for (i, s, e) in runs]
 
         self.waterfall.append_line(''.join(chars))
 
@@ -458,15 +692,18 @@ class Constellation(Visualizer):
         self.plot.update_style(self.style['plot'])
         self.windows = [self.plot]
 
-    def update_sample(self, sample: list[np.complex64]) -> None:
+        # reused for every frame until the next layout
         r = self.iqrange
-        plot = Plot(self.plot.width, self.plot.height, -r, -r, r, r)
+        self._plot = Plot(self.plot.width, self.plot.height, -r, -r, r, r)
+
+    def update_sample(self, sample: np.ndarray) -> None:
+        (r, plot) = (self.iqrange, self._plot)
+        plot.clear()
         # axis
         plot.line(-r, 0, r, 0)
         plot.line(0, r, 0, -r)
         # iq points
-        for point in zip(np.real(sample), np.imag(sample)):
-            plot.point(point[0], point[1])
+        plot.points(sample.real.tolist(), sample.imag.tolist())
         self.plot.update_content(plot.draw())
 
     def update_radio(self, radio: Radio) -> None:
@@ -498,6 +735,11 @@ def config_visualizer(
     # default to non-segmented periodogram for RtlRadio
     dnperseg = fftsize if isinstance(radio, RtlRadio) else fftsize//4
     nperseg = dnperseg if nperseg is None else min(fftsize, nperseg)
+    # computed once and shared instead of scipy rebuilding it every frame
+    try:
+        window = make_window(options.window, nperseg)
+    except ValueError:
+        raise optparse.OptionValueError(f'unknown window {options.window}.')
 
     if name == 'psd':
         return PSD(
@@ -505,7 +747,7 @@ def config_visualizer(
             mindbfs=options.mindbfs,
             maxdbfs=options.maxdbfs,
             nperseg=nperseg,
-            window=options.window,
+            window=window,
             zoff=-1.0,
             style=Styles[options.style]
         )
@@ -515,7 +757,7 @@ def config_visualizer(
             mindbfs=options.mindbfs,
             maxdbfs=options.maxdbfs,
             nperseg=nperseg,
-            window=options.window,
+            window=window,
             zoff=-1.0,
             style=Styles[options.style]
         )
@@ -528,7 +770,7 @@ def config_visualizer(
             fstop=fstop,
             mindbfs=options.mindbfs,
             nperseg=nperseg,
-            window=options.window,
+            window=window,
             zoff=-1.0,
             style=Styles[options.style]
         )